@@ -0,0 +1,62 @@
+"""
+Eval Questions - Parses EVAL_QUESTIONS.md into reusable question sets
+Shared by the load test and tuning scripts so they exercise the same questions
+"""
+import re
+from typing import Dict, List
+
+SECTION_PATTERN = re.compile(r'^##\s+([A-Z])\)')
+QUOTE_PATTERN = re.compile(r'“([^”]+)”')
+EXPECTED_PATTERN = re.compile(r'“([^”]+)”\s*→\s*(.+)$')
+
+
+def load_eval_questions(path: str = "EVAL_QUESTIONS.md") -> Dict[str, List[str]]:
+    """
+    Return quoted questions grouped by section letter, e.g. {"A": [...], "B": [...]}
+    "Expect:" lines are skipped since their quotes are expected answers, not questions
+    """
+    sections = {}
+    current = None
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+
+            match = SECTION_PATTERN.match(stripped)
+            if match:
+                current = match.group(1)
+                sections.setdefault(current, [])
+                continue
+
+            if current is None or stripped.lstrip("- ").startswith("Expect"):
+                continue
+
+            for question in QUOTE_PATTERN.findall(stripped):
+                question = question.strip()
+                # Single quoted words are prose emphasis, not prompts
+                if len(question.split()) < 3:
+                    continue
+                if question not in sections[current]:
+                    sections[current].append(question)
+
+    return {section: qs for section, qs in sections.items() if qs}
+
+
+def load_expected_sources(path: str = "EVAL_QUESTIONS.md") -> List[Dict]:
+    """
+    Return [{"question": ..., "sources": [...]}] for lines written as
+    - “question” → file_a.pdf, file_b.xlsx
+    Out-of-scope questions are written "→ none" and get an empty sources list
+    """
+    expected = []
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            match = EXPECTED_PATTERN.search(line.strip())
+            if match:
+                sources = [s.strip() for s in match.group(2).split(",") if s.strip()]
+                if sources == ["none"]:
+                    sources = []
+                expected.append({"question": match.group(1).strip(), "sources": sources})
+
+    return expected
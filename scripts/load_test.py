@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Load Test - Simulates many concurrent users against AgenticRAGChatbot
+Uses a deterministic LLM stub so numbers reflect our own pipeline
+(security, memory, retrieval) instead of Ollama generation time
+"""
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.rag_engine as rag_engine
+from src.chatbot import AgenticRAGChatbot
+from src.memory import MemorySystem
+from eval_questions import load_eval_questions
+
+
+class StubLLM:
+    """
+    Drop-in replacement for the ollama module used by RAGEngine
+    Same prompt always gives the same answer: the first context line
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def chat(self, model, messages, options=None):
+        with self._lock:
+            self.calls += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        prompt = messages[-1]["content"]
+        context = prompt.split("Question:")[0].replace("Context:", "").strip()
+        first_line = next((line for line in context.splitlines() if line.strip()), "")
+
+        return {"message": {"content": first_line[:200] or "No information available."}}
+
+
+def parse_mix(mix, questions):
+    """Turn 'A=3,B=1' into a weighted list of (section, question) pairs"""
+    weighted = []
+    for part in mix.split(","):
+        section, _, weight = part.partition("=")
+        section = section.strip().upper()
+        if section not in questions:
+            raise ValueError(f"Unknown question section: {section}")
+        weight = int(weight) if weight else 1
+        for question in questions[section]:
+            weighted.extend([(section, question)] * weight)
+    return weighted
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def current_rss_mb():
+    """Resident memory of this process in MB (peak RSS where /proc is missing)"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def directory_size_kb(path):
+    total = 0
+    for filename in os.listdir(path):
+        filepath = os.path.join(path, filename)
+        if os.path.isfile(filepath):
+            total += os.path.getsize(filepath)
+    return total / 1024
+
+
+class LoadTest:
+    """
+    Runs N simulated users in parallel, each going through several sessions
+    Records per-request latency/status and samples memory in the background
+    """
+
+    def __init__(self, bot, workload, args):
+        self.bot = bot
+        self.workload = workload
+        self.args = args
+        self.records = []
+        self.samples = []
+        # Messages each session should hold if every successful chat was saved
+        self.expected_messages = {}
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def run_user(self, user_index):
+        rng = random.Random(self.args.seed + user_index)
+        user_id = f"load_user_{user_index}"
+        token = self.bot.register_user(user_id)
+
+        for _ in range(self.args.sessions_per_user):
+            if self.args.shared_sessions:
+                # Users write to the same session files concurrently
+                session_id = f"load_shared_{rng.randrange(self.args.shared_sessions)}"
+            else:
+                session_id = f"load_{uuid.uuid4().hex[:8]}"
+
+            for _ in range(self.args.questions_per_session):
+                section, question = rng.choice(self.workload)
+
+                start = time.perf_counter()
+                try:
+                    result = self.bot.chat(question, session_id, user_id, token)
+                    status = result["status"]
+                    code = result.get("code", 200)
+                except Exception as e:
+                    status = "exception"
+                    code = type(e).__name__
+                latency = time.perf_counter() - start
+
+                with self._lock:
+                    if status == "success":
+                        # chat() saves the question and the answer
+                        self.expected_messages[session_id] = self.expected_messages.get(session_id, 0) + 2
+                    self.records.append({
+                        "user": user_id,
+                        "section": section,
+                        "finished_at": time.perf_counter(),
+                        "latency": latency,
+                        "status": status,
+                        "code": code
+                    })
+
+                if self.args.think_time > 0:
+                    time.sleep(rng.expovariate(1 / self.args.think_time))
+
+    def sample_memory(self, started):
+        while not self._done.is_set():
+            with self._lock:
+                completed = len(self.records)
+            self.samples.append({
+                "elapsed_s": round(time.perf_counter() - started, 2),
+                "completed_requests": completed,
+                "rss_mb": round(current_rss_mb(), 1),
+                "memory_store_kb": round(directory_size_kb(self.bot.memory.storage_path), 1)
+            })
+            self._done.wait(self.args.sample_interval)
+
+    def run(self):
+        started = time.perf_counter()
+        sampler = threading.Thread(target=self.sample_memory, args=(started,), daemon=True)
+        sampler.start()
+
+        with ThreadPoolExecutor(max_workers=self.args.users) as pool:
+            list(pool.map(self.run_user, range(self.args.users)))
+
+        wall_time = time.perf_counter() - started
+        self._done.set()
+        sampler.join()
+        self.samples.append({
+            "elapsed_s": round(wall_time, 2),
+            "completed_requests": len(self.records),
+            "rss_mb": round(current_rss_mb(), 1),
+            "memory_store_kb": round(directory_size_kb(self.bot.memory.storage_path), 1)
+        })
+
+        return self.report(wall_time)
+
+    def check_memory(self):
+        """
+        Compare saved messages with successful chats per session
+        save_message is an unlocked read-modify-write, so concurrent writers lose updates
+        """
+        stored, unreadable = 0, 0
+        for session_id in self.expected_messages:
+            try:
+                conversation = self.bot.memory._load_raw(session_id) or {}
+                stored += len(conversation.get("messages", []))
+            except ValueError:
+                unreadable += 1
+
+        expected = sum(self.expected_messages.values())
+        return {
+            "sessions": len(self.expected_messages),
+            "expected_messages": expected,
+            "stored_messages": stored,
+            "lost_messages": max(0, expected - stored),
+            "unreadable_sessions": unreadable
+        }
+
+    def report(self, wall_time):
+        total = len(self.records)
+        latencies = sorted(r["latency"] for r in self.records)
+        successes = [r for r in self.records if r["status"] == "success"]
+
+        errors = {}
+        for r in self.records:
+            if r["status"] != "success":
+                key = str(r["code"])
+                errors[key] = errors.get(key, 0) + 1
+
+        by_section = {}
+        for r in self.records:
+            by_section.setdefault(r["section"], []).append(r["latency"])
+
+        return {
+            "config": {
+                "users": self.args.users,
+                "sessions_per_user": self.args.sessions_per_user,
+                "questions_per_session": self.args.questions_per_session,
+                "think_time_s": self.args.think_time,
+                "llm_latency_s": self.args.llm_latency,
+                "mix": self.args.mix,
+                "shared_sessions": self.args.shared_sessions,
+                "answer_mode": self.args.answer_mode,
+                "seed": self.args.seed
+            },
+            "total_requests": total,
+            "wall_time_s": round(wall_time, 3),
+            "throughput_rps": round(total / wall_time, 2) if wall_time else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50) * 1000, 1),
+                "p95": round(percentile(latencies, 95) * 1000, 1),
+                "p99": round(percentile(latencies, 99) * 1000, 1),
+                "max": round(latencies[-1] * 1000, 1) if latencies else 0.0
+            },
+            "latency_p50_ms_by_section": {
+                section: round(percentile(sorted(values), 50) * 1000, 1)
+                for section, values in sorted(by_section.items())
+            },
+            "error_rate": round((total - len(successes)) / total, 4) if total else 0.0,
+            "errors": errors,
+            "memory_consistency": self.check_memory(),
+            "memory_samples": self.samples
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test with a stubbed LLM")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--sessions-per-user", type=int, default=2)
+    parser.add_argument("--questions-per-session", type=int, default=5)
+    parser.add_argument("--think-time", type=float, default=0.5,
+                        help="Mean seconds between questions (exponential)")
+    parser.add_argument("--shared-sessions", type=int, default=0,
+                        help="Draw session ids from a pool of N shared sessions (0: one per session)")
+    parser.add_argument("--mix", default="A=3,B=1,C=1,D=1",
+                        help="Section weights from EVAL_QUESTIONS.md")
+    parser.add_argument("--llm-latency", type=float, default=0.0,
+                        help="Seconds the stub LLM sleeps per call")
+    parser.add_argument("--answer-mode", default="generative",
+                        choices=["generative", "extractive"])
+    parser.add_argument("--max-requests-per-hour", type=int, default=None,
+                        help="Override the per-user rate limit")
+    parser.add_argument("--memory-path", default=None,
+                        help="Memory store to write to (default: temp dir)")
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="artifacts/load_test_output.json")
+    args = parser.parse_args()
+
+    questions = load_eval_questions("EVAL_QUESTIONS.md")
+    workload = parse_mix(args.mix, questions)
+
+    stub = StubLLM(latency=args.llm_latency)
+    rag_engine.ollama = stub
+
+    print("Initializing chatbot...")
+    bot = AgenticRAGChatbot(answer_mode=args.answer_mode)
+    # Keep load test sessions out of the real memory store
+    bot.memory = MemorySystem(storage_path=args.memory_path or tempfile.mkdtemp(prefix="load_memory_"))
+    if args.max_requests_per_hour is not None:
+        bot.security.max_requests = args.max_requests_per_hour
+
+    total = args.users * args.sessions_per_user * args.questions_per_session
+    print(f"Running {total} requests across {args.users} concurrent users...")
+    report = LoadTest(bot, workload, args).run()
+    report["llm_calls"] = stub.calls
+    report["rag_stats"] = dict(bot.rag.stats)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    latency = report["latency_ms"]
+    print(f"\nLoad test complete!")
+    print(f"Throughput: {report['throughput_rps']} req/s over {report['wall_time_s']}s")
+    print(f"Latency p50/p95/p99: {latency['p50']} / {latency['p95']} / {latency['p99']} ms")
+    print(f"Error rate: {report['error_rate']:.2%} {report['errors']}")
+    print(f"Lost memory messages: {report['memory_consistency']['lost_messages']}")
+    print(f"Generated: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Retrieval Tuning - Sweeps chunking and k settings against known expected sources
+Builds one index per chunking config and reports recall@k, MRR,
+prompt size and per-stage latency so settings are chosen on data
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.rag_engine import RAGEngine
+from src.document_processor import ParsedTextCache
+from src.deduplicator import ChunkDeduplicator
+from eval_questions import load_expected_sources
+
+
+def parse_configs(configs):
+    """Turn '300:50,600:100' into [(300, 50), (600, 100)]"""
+    parsed = []
+    for part in configs.split(","):
+        size, _, overlap = part.partition(":")
+        parsed.append((int(size), int(overlap or 0)))
+    return parsed
+
+
+def count_tokens(text):
+    """Approximate token count: words and punctuation marks"""
+    return len(re.findall(r"\w+|[^\w\s]", text))
+
+
+def result_files(doc):
+    """Every file a retrieved chunk cites, including collapsed duplicates"""
+    files = {os.path.basename(doc.metadata.get("source", "unknown"))}
+    files.update(s["file"] for s in ChunkDeduplicator.expand_sources(doc.metadata))
+    return files
+
+
+def warm_parse_cache(documents_path="data/documents"):
+    """
+    Parse every document into the cache once, before any index is built
+    Every config then reads parsed text from cache, so 'parse s' is comparable
+    """
+    cache = ParsedTextCache()
+    start = time.perf_counter()
+    for filename in sorted(os.listdir(documents_path)):
+        filepath = os.path.join(documents_path, filename)
+        if os.path.isfile(filepath):
+            try:
+                cache.process_file(filepath)
+            except Exception as e:
+                print(f"  ✗ {filename}: {e}")
+    return round(time.perf_counter() - start, 3)
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def evaluate(engine, expected, k_values, context_k):
+    """
+    Run every expected-source question against the engine's current index
+    Out-of-scope questions (no sources) only contribute their confidence
+    """
+    max_k = max(k_values)
+    recall = {k: [] for k in k_values}
+    reciprocal_ranks, prompt_tokens, embed_ms, retrieve_ms = [], [], [], []
+    confidences, out_of_scope_confidences = [], []
+
+    # Warm up the embedding model so the first question isn't penalized
+    engine.search(expected[0]["question"], k=max_k)
+
+    for item in expected:
+        question, wanted = item["question"], set(item["sources"])
+
+        if not wanted:
+            out_of_scope_confidences.append(engine.confidence(engine.search(question, k=max_k)))
+            continue
+
+        start = time.perf_counter()
+        engine.embeddings.embed_query(question)
+        embed_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        results = engine.search(question, k=max_k)
+        retrieve_ms.append((time.perf_counter() - start) * 1000)
+
+        docs = [doc for doc, score in results]
+        confidences.append(engine.confidence(results))
+        cited = [result_files(doc) & wanted for doc in docs]
+
+        for k in k_values:
+            found = set().union(*cited[:k])
+            recall[k].append(len(found) / len(wanted))
+
+        first_hit = next((rank for rank, hits in enumerate(cited, 1) if hits), None)
+        reciprocal_ranks.append(1 / first_hit if first_hit else 0.0)
+        prompt_tokens.append(count_tokens(engine.build_prompt(question, docs[:context_k])))
+
+    return {
+        "recall_at_k": {str(k): round(mean(v), 3) for k, v in recall.items()},
+        "mrr": round(mean(reciprocal_ranks), 3),
+        # min_confidence should sit between these two: above every
+        # out-of-scope question, below every answerable one
+        "min_answerable_confidence": round(min(confidences), 3),
+        "max_out_of_scope_confidence": round(max(out_of_scope_confidences), 3) if out_of_scope_confidences else None,
+        "avg_confidence": round(mean(confidences), 3),
+        "avg_prompt_tokens": round(mean(prompt_tokens), 1),
+        "avg_embed_ms": round(mean(embed_ms), 1),
+        "avg_retrieve_ms": round(mean(retrieve_ms), 1)
+    }
+
+
+def markdown_report(rows, k_values, context_k, cache_warm_s=None):
+    recall_headers = " | ".join(f"R@{k}" for k in k_values)
+    lines = [
+        "# Retrieval Tuning Report",
+        "",
+        f"Prompt tokens are approximate (words + punctuation) using the top {context_k} chunks.",
+        "Retrieve time includes query embedding.",
+        "Parse s reads from a pre-warmed parse cache, so it is comparable across configs;"
+        f" warming it took {cache_warm_s} s (cold only if the cache was empty). Chunk s includes dedup.",
+        "Confidence is the best chunk's cosine similarity. Set min_confidence above the",
+        "out-of-scope max and below the answerable min.",
+        "",
+        f"| chunk_size | overlap | chunks | {recall_headers} | MRR | answerable min conf | out-of-scope max conf | prompt tokens "
+        f"| retrieve ms | parse s (warm) | chunk s | index s |",
+        "|" + "---|" * (11 + len(k_values))
+    ]
+    for row in rows:
+        recalls = " | ".join(str(row["recall_at_k"][str(k)]) for k in k_values)
+        build = row["build"]
+        lines.append(
+            f"| {row['chunk_size']} | {row['chunk_overlap']} | {build.get('chunks', '-')} | {recalls} "
+            f"| {row['mrr']} | {row['min_answerable_confidence']} | {row['max_out_of_scope_confidence']} | {row['avg_prompt_tokens']} | {row['avg_retrieve_ms']} "
+            f"| {build.get('parse_s', '-')} | {build.get('chunk_s', '-')} | {build.get('index_s', '-')} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def sweep(configs, workdir, expected, k_values, context_k):
+    """Build one index per chunking config under workdir and evaluate it"""
+    size, overlap = configs[0]
+    engine = RAGEngine(
+        persist_directory=os.path.join(workdir, f"chroma_{size}_{overlap}"),
+        chunk_size=size,
+        chunk_overlap=overlap,
+        context_k=context_k
+    )
+
+    rows = []
+    for size, overlap in configs:
+        print(f"\nEvaluating chunk_size={size}, chunk_overlap={overlap}...")
+        persist_directory = os.path.join(workdir, f"chroma_{size}_{overlap}")
+        if engine.persist_directory != persist_directory:
+            # Reuse the loaded embedding model, only rebuild the index
+            engine.chunk_size = size
+            engine.chunk_overlap = overlap
+            engine.persist_directory = persist_directory
+            engine.build_stats = {}
+            engine.load_documents()
+
+        row = {"chunk_size": size, "chunk_overlap": overlap, "build": dict(engine.build_stats)}
+        row.update(evaluate(engine, expected, k_values, context_k))
+        rows.append(row)
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep chunking and k settings for retrieval quality vs latency")
+    parser.add_argument("--configs", default="300:50,600:100,1000:150,1500:200",
+                        help="Comma separated chunk_size:chunk_overlap pairs")
+    parser.add_argument("--k", default="1,2,3,5", help="k values for recall@k")
+    parser.add_argument("--context-k", type=int, default=2,
+                        help="Chunks placed in the prompt (RAGEngine.context_k)")
+    parser.add_argument("--workdir", default=None,
+                        help="Where to build the sweep indexes (default: temp dir)")
+    parser.add_argument("--output", default="artifacts/tuning_report.json")
+    args = parser.parse_args()
+
+    configs = parse_configs(args.configs)
+    k_values = sorted({int(k) for k in args.k.split(",")})
+    expected = load_expected_sources("EVAL_QUESTIONS.md")
+    if not expected:
+        print("No expected sources found in EVAL_QUESTIONS.md")
+        sys.exit(1)
+
+    print("Warming parse cache...")
+    cache_warm_s = warm_parse_cache()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="tune_retrieval_")
+    try:
+        rows = sweep(configs, workdir, expected, k_values, args.context_k)
+    finally:
+        if not args.workdir:
+            # One full Chroma index per config - don't leave them behind
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "questions": sum(1 for item in expected if item["sources"]),
+        "out_of_scope_questions": sum(1 for item in expected if not item["sources"]),
+        "k_values": k_values,
+        "context_k": args.context_k,
+        "cache_warm_s": cache_warm_s,
+        "configs": rows
+    }
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    markdown = markdown_report(rows, k_values, args.context_k, cache_warm_s)
+    markdown_path = os.path.splitext(args.output)[0] + ".md"
+    with open(markdown_path, "w") as f:
+        f.write(markdown)
+
+    print("\n" + markdown)
+    print(f"Generated: {args.output}, {markdown_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,12 +17,12 @@ class AgenticRAGChatbot:
     4. Response formatting with sources
     """
 
-    def __init__(self):
+    def __init__(self, answer_mode="generative"):
         print("\n" + "="*60)
         print("Initializing Agentic RAG Chatbot...")
         print("="*60)
 
-        self.rag = RAGEngine()
+        self.rag = RAGEngine(answer_mode=answer_mode)
         self.memory = MemorySystem()
         self.security = SecurityLayer()
 
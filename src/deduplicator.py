@@ -0,0 +1,208 @@
+"""
+Chunk Deduplicator - Collapses near-duplicate chunks before indexing
+Strips per-file boilerplate lines (page headers, slide footers) before chunking,
+then uses MinHash signatures + LSH banding so only likely pairs get compared
+"""
+import re
+import json
+import random
+import zlib
+from typing import List, Dict
+
+# Mersenne prime larger than any 32-bit shingle hash
+PRIME = (1 << 61) - 1
+
+
+class ChunkDeduplicator:
+    """
+    Near-duplicate detection that:
+    1. Turns each chunk into word shingles
+    2. Builds a MinHash signature per chunk
+    3. Buckets signatures with LSH bands to find candidate pairs
+    4. Merges candidates whose estimated Jaccard similarity with the cluster
+       representative passes the threshold and whose figures are identical
+    """
+
+    def __init__(self, threshold=0.9, num_perm=64, bands=16, shingle_size=3, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = random.Random(seed)
+        self.perms = [
+            (rng.randrange(1, PRIME), rng.randrange(0, PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def shingles(self, text):
+        """Hashed word n-grams of normalized text"""
+        words = re.findall(r'\w+', text.lower())
+        n = min(self.shingle_size, len(words))
+        if n == 0:
+            return set()
+        return {
+            zlib.crc32(" ".join(words[i:i + n]).encode())
+            for i in range(len(words) - n + 1)
+        }
+
+    def signature(self, shingles):
+        """MinHash signature: min of each hash permutation over the shingles"""
+        return [
+            min((a * s + b) % PRIME for s in shingles)
+            for a, b in self.perms
+        ]
+
+    @staticmethod
+    def _boilerplate_key(line, unit_numbers):
+        """
+        Line identity ignoring case, spacing and the page/slide number itself
+        Other figures stay, so per-page values ("Revenue: $1.8M") never match
+        """
+        line = " ".join(line.lower().split())
+        # Only a standalone number, once ("Page 3 of 10" -> "page # of 10")
+        match = re.search(r'(?<![\w.,$])\d+(?![\w.,%])', line)
+        if match and match.group() in unit_numbers:
+            line = line[:match.start()] + '#' + line[match.end():]
+        return line
+
+    @staticmethod
+    def _unit_numbers(metadata):
+        """Numbers a page header/footer may print for this unit"""
+        if 'page' in metadata:
+            # Stored 0-based, printed 1-based
+            return {str(metadata['page'] + 1)}
+        if 'slide' in metadata:
+            return {str(metadata['slide'])}
+        return set()
+
+    @classmethod
+    def strip_boilerplate(cls, documents: List[Dict], min_pages=3, min_share=0.5) -> List[Dict]:
+        """
+        Remove lines repeated across the pages/slides of one file
+        A line counts as boilerplate when it appears (page number ignored) on at least
+        min_pages units and min_share of the file's units; only its first
+        occurrence is kept so the text stays indexed once
+        """
+        by_source = {}
+        for doc in documents:
+            by_source.setdefault(doc['metadata'].get('source'), []).append(doc)
+
+        for pages in by_source.values():
+            if len(pages) < min_pages:
+                continue
+
+            counts = {}
+            for doc in pages:
+                unit_numbers = cls._unit_numbers(doc['metadata'])
+                keys = {
+                    cls._boilerplate_key(line, unit_numbers)
+                    for line in doc['text'].split('\n') if line.strip()
+                }
+                for key in keys:
+                    counts[key] = counts.get(key, 0) + 1
+
+            limit = max(min_pages, min_share * len(pages))
+            boilerplate = {key for key, count in counts.items() if count >= limit}
+            if not boilerplate:
+                continue
+
+            seen = set()
+            for doc in pages:
+                unit_numbers = cls._unit_numbers(doc['metadata'])
+                kept = []
+                for line in doc['text'].split('\n'):
+                    key = cls._boilerplate_key(line, unit_numbers)
+                    if key in boilerplate:
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                    kept.append(line)
+                doc['text'] = '\n'.join(kept)
+
+        return [doc for doc in documents if doc['text'].strip()]
+
+    @staticmethod
+    def numbers(text):
+        """Numeric tokens of a chunk; copies with different figures are not duplicates"""
+        return frozenset(re.findall(r'\d+(?:[.,]\d+)*', text))
+
+    def similarity(self, sig_a, sig_b):
+        """Estimated Jaccard similarity from two MinHash signatures"""
+        matches = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+        return matches / self.num_perm
+
+    def find_clusters(self, texts: List[str]) -> List[List[int]]:
+        """
+        Group text indexes into clusters of near-duplicates (singletons included)
+        The earliest chunk of a cluster is its representative, and every other
+        member must match the representative directly - no chaining A~B~C
+        """
+        signatures, numbers = {}, {}
+        for i, text in enumerate(texts):
+            shingles = self.shingles(text)
+            if shingles:
+                signatures[i] = self.signature(shingles)
+                numbers[i] = self.numbers(text)
+
+        buckets = {}
+        for i, sig in signatures.items():
+            for band in range(self.bands):
+                key = (band, tuple(sig[band * self.rows:(band + 1) * self.rows]))
+                buckets.setdefault(key, []).append(i)
+
+        candidates = {}
+        for members in buckets.values():
+            for pos, first in enumerate(members):
+                for other in members[pos + 1:]:
+                    candidates.setdefault(first, set()).add(other)
+
+        assigned = {}
+        clusters = []
+        for i in range(len(texts)):
+            if i in assigned:
+                continue
+            cluster = [i]
+            assigned[i] = i
+            for other in sorted(candidates.get(i, ())):
+                if other in assigned or numbers[i] != numbers[other]:
+                    continue
+                if self.similarity(signatures[i], signatures[other]) >= self.threshold:
+                    cluster.append(other)
+                    assigned[other] = i
+            clusters.append(cluster)
+
+        return clusters
+
+    def deduplicate(self, documents: List, source_info) -> List:
+        """
+        Keep one Document per near-duplicate cluster
+        The kept Document carries the other copies' citations in
+        metadata["duplicate_sources"] as a JSON string (Chroma only stores scalars)
+        """
+        clusters = self.find_clusters([doc.page_content for doc in documents])
+
+        kept = []
+        for cluster in sorted(clusters):
+            representative = documents[cluster[0]]
+            duplicates = []
+            for i in cluster[1:]:
+                info = source_info(documents[i].metadata)
+                if info not in duplicates and info != source_info(representative.metadata):
+                    duplicates.append(info)
+
+            if duplicates:
+                representative.metadata["duplicate_sources"] = json.dumps(duplicates)
+            kept.append(representative)
+
+        return kept
+
+    @staticmethod
+    def expand_sources(metadata: Dict) -> List[Dict]:
+        """Citations recorded for chunks that were collapsed into this one"""
+        raw = metadata.get("duplicate_sources")
+        return json.loads(raw) if raw else []
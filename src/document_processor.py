@@ -2,12 +2,19 @@
 Document Processor - Handles multiple file formats
 """
 import os
-from typing import List, Dict
+import gzip
+import json
+import hashlib
+import tempfile
+from typing import List, Dict, Optional
 from pypdf import PdfReader
 from docx import Document
 import openpyxl
 from pptx import Presentation
 
+# Bump whenever a process_* method changes its output, so cached text is re-parsed
+PROCESSOR_VERSION = "1"
+
 
 class DocumentProcessor:
     
@@ -129,3 +136,84 @@ class DocumentProcessor:
             return processors[ext](filepath)
         else:
             raise ValueError(f"Unsupported file format: {ext}")
+
+
+class ParsedTextCache:
+    """
+    Persistent cache of DocumentProcessor output
+    Keyed by file content hash + PROCESSOR_VERSION, stored as gzipped JSON,
+    so re-chunking and re-indexing skip the parsers for unchanged files
+    """
+
+    def __init__(self, cache_path: str = "./parse_cache"):
+        # Created on first write, so loading an existing index touches nothing
+        self.cache_path = cache_path
+
+    @staticmethod
+    def cache_key(filepath: str) -> str:
+        """Hash of processor version, file extension and file bytes"""
+        digest = hashlib.sha256()
+        digest.update(PROCESSOR_VERSION.encode())
+        digest.update(os.path.splitext(filepath)[1].lower().encode())
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_path, f"{key}.json.gz")
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Return cached documents for a cache key, or None on a miss"""
+        entry = self._entry_path(key)
+        if not os.path.exists(entry):
+            return None
+
+        try:
+            with gzip.open(entry, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, EOFError, ValueError):
+            # Truncated or corrupt entry: drop it so the file gets re-parsed
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+            return None
+
+    def put(self, key: str, documents: List[Dict]) -> bool:
+        """
+        Store parsed documents under a cache key
+        Returns False if the cache could not be written (disk full, read-only dir);
+        caching is best effort and must never lose parsed content
+        """
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_path, exist_ok=True)
+            # Unique temp name so concurrent builders don't clobber each other
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_path, suffix='.tmp')
+            with gzip.open(os.fdopen(fd, 'wb'), 'wt', encoding='utf-8') as f:
+                json.dump(documents, f, separators=(',', ':'))
+            os.replace(tmp_path, self._entry_path(key))
+            return True
+        except OSError:
+            if tmp_path and os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return False
+
+    def process_file(self, filepath: str) -> List[Dict]:
+        """Cached version of DocumentProcessor.process_file"""
+        key = self.cache_key(filepath)
+        documents = self.get(key)
+
+        if documents is None:
+            documents = DocumentProcessor.process_file(filepath)
+            self.put(key, documents)
+        else:
+            # Same content may live under a new name; cite the current one
+            for doc in documents:
+                doc['metadata']['source'] = os.path.basename(filepath)
+
+        return documents
@@ -4,6 +4,7 @@ Main Entry Point - Run this to start the chatbot
 import uuid
 import sys
 import os
+import argparse
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -13,7 +14,13 @@ from src.chatbot import AgenticRAGChatbot
 def run_chatbot():
     """Start the interactive chatbot"""
     
-    bot = AgenticRAGChatbot()
+    parser = argparse.ArgumentParser(description="Agentic RAG Chatbot")
+    parser.add_argument("--answer-mode", choices=["generative", "extractive"],
+                        default=os.environ.get("ANSWER_MODE", "generative"),
+                        help="extractive answers lookup questions without the LLM (env: ANSWER_MODE)")
+    args = parser.parse_args()
+    
+    bot = AgenticRAGChatbot(answer_mode=args.answer_mode)
     
     print("\n" + "="*70)
     print("🤖  AGENTIC RAG CHATBOT")
@@ -28,6 +35,7 @@ def run_chatbot():
     print("  'quit'     - Exit chatbot")
     print("  'history'  - Show conversation history")
     print("  'sessions' - Show all past sessions")
+    print("  'stats'    - Show how answers were produced")
     print("  'clear'    - Start new session")
     print("="*70 + "\n")
     
@@ -68,6 +76,20 @@ def run_chatbot():
                 print()
                 continue
             
+            if user_input.lower() == "stats":
+                stats = bot.rag.stats
+                print(f"\n📊 Answer Stats (mode: {bot.rag.answer_mode}):")
+                print(f"  Questions:           {stats['queries']}")
+                print(f"  Extractive (no LLM): {stats['extractive']}")
+                print(f"  LLM generated:       {stats['llm']}")
+                print(f"  Not in documents:    {stats['below_threshold']}")
+                print(f"  No results:          {stats['no_results']}")
+                if stats['queries']:
+                    skipped = stats['queries'] - stats['llm']
+                    print(f"  LLM skipped:         {skipped / stats['queries']:.0%}")
+                print()
+                continue
+            
             if user_input.lower() == "clear":
                 session_id = str(uuid.uuid4())[:8]
                 print(f"\n✅ New session started: {session_id}\n")
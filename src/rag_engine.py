@@ -5,23 +5,74 @@ warnings.filterwarnings('ignore')
 RAG Engine - Multi-format OPTIMIZED FOR SPEED
 """
 import os
-from typing import List, Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional
+import numpy as np
 import ollama
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
-from src.document_processor import DocumentProcessor
+from src.document_processor import ParsedTextCache
+from src.deduplicator import ChunkDeduplicator
+from src.sentence_splitter import split_sentences
+
+ANSWER_MODES = ("generative", "extractive")
+SENTENCE_CACHE_SIZE = 512
 
 
 class RAGEngine:
-    def __init__(self, documents_path: str = "data/documents"):
+    def __init__(self, documents_path: str = "data/documents",
+                 cache_path: str = "./parse_cache",
+                 min_confidence: float = 0.35,
+                 dedup_threshold: float = 0.9,
+                 answer_mode: str = "generative",
+                 extractive_threshold: float = 0.6,
+                 persist_directory: str = "./chroma_db",
+                 chunk_size: int = 600,
+                 chunk_overlap: int = 100,
+                 top_k: int = 3,
+                 context_k: int = 2):
         print("\n" + "="*60)
         print("Initializing Agentic RAG Chatbot...")
         print("="*60)
         
         self.documents_path = documents_path
+        self.persist_directory = persist_directory
         self.vectorstore = None
+        # Retrieval settings - compare alternatives with scripts/tune_retrieval.py
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.top_k = top_k
+        self.context_k = context_k
+        # Seconds per ingestion stage of the last _build_database run
+        self.build_stats = {}
+        self.parse_cache = ParsedTextCache(cache_path)
+        # Below this cosine similarity of the best chunk we answer "not found" without the LLM
+        self.min_confidence = min_confidence
+        self.deduplicator = ChunkDeduplicator(threshold=dedup_threshold)
+        
+        if answer_mode not in ANSWER_MODES:
+            raise ValueError(f"Unsupported answer mode: {answer_mode}")
+        # "extractive" returns the best matching sentence when it clears
+        # extractive_threshold, and only falls back to the LLM otherwise
+        self.answer_mode = answer_mode
+        self.extractive_threshold = extractive_threshold
+        # LRU of chunk text -> (sentences, vectors), shared by concurrent answer() calls
+        self._sentence_cache = OrderedDict()
+        self._sentence_lock = threading.Lock()
+        
+        # How each answer was produced
+        self.stats = {
+            "queries": 0,
+            "no_results": 0,
+            "below_threshold": 0,
+            "extractive": 0,
+            "llm": 0
+        }
+        self._stats_lock = threading.Lock()
         
         print("Loading embeddings model...")
         self.embeddings = HuggingFaceEmbeddings(
@@ -31,10 +82,10 @@ class RAGEngine:
         self.load_documents()
     
     def load_documents(self):
-        if os.path.exists("./chroma_db"):
+        if os.path.exists(self.persist_directory):
             print("Loading existing vector database...")
             self.vectorstore = Chroma(
-                persist_directory="./chroma_db",
+                persist_directory=self.persist_directory,
                 embedding_function=self.embeddings
             )
             print("Vector database loaded!")
@@ -45,13 +96,15 @@ class RAGEngine:
     def _build_database(self):
         print(f"Loading documents from {self.documents_path}...")
         all_docs = []
+        started = time.perf_counter()
         
-        for filename in os.listdir(self.documents_path):
+        # Sorted so dedup representatives (primary citations) are deterministic
+        for filename in sorted(os.listdir(self.documents_path)):
             filepath = os.path.join(self.documents_path, filename)
             
             if os.path.isfile(filepath):
                 try:
-                    docs = DocumentProcessor.process_file(filepath)
+                    docs = self.parse_cache.process_file(filepath)
                     all_docs.extend(docs)
                     print(f"  ✓ {filename}")
                 except Exception as e:
@@ -59,6 +112,10 @@ class RAGEngine:
         
         print(f"Loaded {len(all_docs)} pages")
         
+        # REPEATED HEADERS/FOOTERS = INDEX THEM ONCE
+        all_docs = ChunkDeduplicator.strip_boilerplate(all_docs)
+        parsed = time.perf_counter()
+        
         documents = [
             Document(page_content=doc['text'], metadata=doc['metadata'])
             for doc in all_docs
@@ -66,30 +123,159 @@ class RAGEngine:
         
         # SMALLER CHUNKS = FASTER
         text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=600,
-            chunk_overlap=100
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap
         )
         splits = text_splitter.split_documents(documents)
         print(f"Created {len(splits)} chunks")
         
+        # ONE VECTOR PER NEAR-DUPLICATE GROUP
+        splits = self.deduplicator.deduplicate(splits, self._source_info)
+        print(f"Kept {len(splits)} chunks after deduplication")
+        chunked = time.perf_counter()
+        
         self.vectorstore = Chroma.from_documents(
             documents=splits,
             embedding=self.embeddings,
-            persist_directory="./chroma_db"
+            persist_directory=self.persist_directory
         )
         
+        self.build_stats = {
+            "chunks": len(splits),
+            "parse_s": round(parsed - started, 3),
+            "chunk_s": round(chunked - parsed, 3),
+            "index_s": round(time.perf_counter() - chunked, 3)
+        }
         print("Vector database ready!")
     
-    def search(self, query: str, k: int = 3) -> List:  # ONLY 3 RESULTS
-        results = self.vectorstore.similarity_search_with_relevance_scores(
-            query, k=k
+    def search(self, query: str, k: Optional[int] = None,
+               query_embedding: Optional[List[float]] = None) -> List:
+        """
+        Top-k chunks with their cosine similarity to the query
+        Pass query_embedding to reuse a vector that was already computed
+        """
+        if query_embedding is None:
+            query_embedding = self.embeddings.embed_query(query)
+        results = self.vectorstore.similarity_search_by_vector_with_relevance_scores(
+            query_embedding, k=k or self.top_k
         )
-        return results
+        # By-vector search returns raw distances despite the method name
+        return [(doc, self.cosine_similarity(distance)) for doc, distance in results]
+    
+    @staticmethod
+    def _source_info(metadata: Dict) -> Dict:
+        """Citation for a chunk: file, type and page if available"""
+        source_info = {
+            "file": os.path.basename(metadata.get("source", "unknown")),
+            "type": metadata.get("type", "pdf")
+        }
+        if "page" in metadata:
+            source_info["page"] = metadata["page"]
+        return source_info
+    
+    def _cite(self, docs: List) -> List[Dict]:
+        """Unique citations for docs, including collapsed duplicates"""
+        sources = []
+        for doc in docs:
+            citations = [self._source_info(doc.metadata)]
+            citations.extend(ChunkDeduplicator.expand_sources(doc.metadata))
+            for source_info in citations:
+                if source_info not in sources:
+                    sources.append(source_info)
+        return sources
+    
+    def _record(self, outcome: str):
+        with self._stats_lock:
+            self.stats["queries"] += 1
+            self.stats[outcome] += 1
+    
+    def _sentence_embeddings(self, text: str, doc_type: str = ""):
+        """Sentences of a chunk and their unit-normalized embeddings (LRU cached per chunk)"""
+        key = (doc_type, text)
+        with self._sentence_lock:
+            cached = self._sentence_cache.get(key)
+            if cached is not None:
+                self._sentence_cache.move_to_end(key)
+                return cached
+        
+        sentences = split_sentences(text, doc_type)
+        vectors = np.zeros((0, 0))
+        if sentences:
+            vectors = np.asarray(self.embeddings.embed_documents(sentences), dtype=np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+        entry = (sentences, vectors)
+        
+        with self._sentence_lock:
+            self._sentence_cache[key] = entry
+            self._sentence_cache.move_to_end(key)
+            while len(self._sentence_cache) > SENTENCE_CACHE_SIZE:
+                self._sentence_cache.popitem(last=False)
+        return entry
+    
+    def extract(self, question: str, docs: List,
+                query_embedding: Optional[List[float]] = None) -> Optional[Dict]:
+        """
+        Best sentence from docs by cosine similarity to the question
+        Returns {"answer", "doc", "score"} or None when nothing clears the threshold
+        """
+        sentences, owners, blocks = [], [], []
+        for doc in docs:
+            doc_sentences, vectors = self._sentence_embeddings(
+                doc.page_content, doc.metadata.get("type", "")
+            )
+            if doc_sentences:
+                sentences.extend(doc_sentences)
+                owners.extend([doc] * len(doc_sentences))
+                blocks.append(vectors)
+        
+        if not sentences:
+            return None
+        
+        if query_embedding is None:
+            query_embedding = self.embeddings.embed_query(question)
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query /= np.linalg.norm(query) + 1e-12
+        scores = np.vstack(blocks) @ query
+        
+        best = int(np.argmax(scores))
+        if scores[best] < self.extractive_threshold:
+            return None
+        return {"answer": sentences[best], "doc": owners[best], "score": float(scores[best])}
+    
+    @staticmethod
+    def build_prompt(question: str, docs: List) -> str:
+        """MINIMAL PROMPT from the retrieved chunks"""
+        context_text = "\n\n".join([doc.page_content for doc in docs])
+        return f"""Context: {context_text}
+
+Question: {question}
+
+Answer in 1-2 sentences:"""
+    
+    @staticmethod
+    def cosine_similarity(distance: float) -> float:
+        """
+        Cosine similarity from a Chroma distance
+        The default l2 space returns the squared distance d, and for the
+        unit-length MiniLM embeddings d = 2 - 2*cos, so cos = 1 - d/2
+        """
+        return 1 - distance / 2
+    
+    @staticmethod
+    def confidence(results: List) -> float:
+        """Cosine similarity of the best chunk, clamped to [0, 1]"""
+        if not results:
+            return 0.0
+        top_score = max(score for doc, score in results)
+        return round(max(0.0, min(1.0, top_score)), 3)
     
     def answer(self, question: str, context: str = "") -> Dict:
-        results = self.search(question)
+        # EMBED ONCE - shared by search and extractive scoring
+        query_embedding = self.embeddings.embed_query(question)
+        results = self.search(question, query_embedding=query_embedding)
         
         if not results:
+            self._record("no_results")
             return {
                 "answer": "No information available.",
                 "sources": [],
@@ -97,16 +283,34 @@ class RAGEngine:
                 "grounded": False
             }
         
-        # USE ONLY TOP 2 DOCS FOR SPEED
-        relevant_docs = [doc for doc, score in results[:2]]
-        context_text = "\n\n".join([doc.page_content for doc in relevant_docs])
+        confidence = self.confidence(results)
         
-        # MINIMAL PROMPT
-        prompt = f"""Context: {context_text}
-
-Question: {question}
-
-Answer in 1-2 sentences:"""
+        # NOTHING RELEVANT = SKIP GENERATION
+        if confidence < self.min_confidence:
+            self._record("below_threshold")
+            return {
+                "answer": "I can't find this in the uploaded documents.",
+                "sources": [],
+                "confidence": confidence,
+                "grounded": False
+            }
+        
+        # USE ONLY TOP context_k DOCS FOR SPEED
+        relevant_docs = [doc for doc, score in results[:self.context_k]]
+        
+        # LOOKUP QUESTIONS = ANSWER IS ALREADY A SENTENCE IN THE CHUNKS
+        if self.answer_mode == "extractive":
+            extracted = self.extract(question, relevant_docs, query_embedding)
+            if extracted:
+                self._record("extractive")
+                return {
+                    "answer": extracted["answer"],
+                    "sources": self._cite([extracted["doc"]]),
+                    "confidence": confidence,
+                    "grounded": True
+                }
+        
+        prompt = self.build_prompt(question, relevant_docs)
         
         response = ollama.chat(
             model="llama3.2",
@@ -118,20 +322,11 @@ Answer in 1-2 sentences:"""
         )
         
         answer_text = response["message"]["content"].strip()
-        
-        sources = []
-        for doc, score in results[:2]:
-            source_info = {
-                "file": os.path.basename(doc.metadata.get("source", "unknown")),
-                "type": doc.metadata.get("type", "pdf")
-            }
-            if "page" in doc.metadata:
-                source_info["page"] = doc.metadata["page"]
-            sources.append(source_info)
+        self._record("llm")
         
         return {
             "answer": answer_text,
-            "sources": sources,
-            "confidence": 1.0,
+            "sources": self._cite(relevant_docs),
+            "confidence": confidence,
             "grounded": True
         }
@@ -0,0 +1,32 @@
+"""
+Sentence Splitter - Cuts retrieved chunks into candidate answer spans
+Newlines mean different things per format, so splitting depends on the chunk's type
+"""
+import re
+from typing import List
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def split_sentences(text: str, doc_type: str = "") -> List[str]:
+    """
+    Candidate answer spans of a chunk, by DocumentProcessor type:
+    - pdf: single newlines are line wraps from extract_text(), so they are joined
+      and only blank lines and . ! ? end a span
+    - xlsx: one row per line, each row is a span
+    - docx/pptx/txt: a newline ends a paragraph, shape or bullet, so it is a
+      span boundary, and . ! ? split further inside each line
+    Spans shorter than 3 words are dropped
+    """
+    if doc_type == "xlsx":
+        parts = text.split("\n")
+    elif doc_type == "pdf":
+        parts = []
+        for paragraph in re.split(r'\n\s*\n', text):
+            paragraph = re.sub(r'\s*\n\s*', ' ', paragraph)
+            parts.extend(SENTENCE_END.split(paragraph))
+    else:
+        parts = []
+        for line in text.split("\n"):
+            parts.extend(SENTENCE_END.split(line))
+    return [part.strip() for part in parts if len(part.split()) >= 3]
@@ -0,0 +1,73 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.sentence_splitter import split_sentences
+
+
+def test_pdf_joins_line_wraps():
+    text = (
+        "Sarah Johnson - Chief Executive Officer (CEO) Background: Former VP\n"
+        "of Engineering at Google Cloud (8 years). Education: MBA from Stanford\n"
+        "GSB.\n\nTechCorp has offices in three cities"
+    )
+    assert split_sentences(text, "pdf") == [
+        "Sarah Johnson - Chief Executive Officer (CEO) Background: Former VP of Engineering at Google Cloud (8 years).",
+        "Education: MBA from Stanford GSB.",
+        "TechCorp has offices in three cities",
+    ]
+
+
+def test_docx_keeps_paragraphs_apart():
+    text = (
+        "Budget Allocation\n"
+        "Digital Advertising: $2 Million\n"
+        "Marketing Director: Jennifer Smith\n"
+        "Content Team: 3 writers, 1 designer"
+    )
+    spans = split_sentences(text, "docx")
+    assert "Marketing Director: Jennifer Smith" in spans
+    assert "Digital Advertising: $2 Million" in spans
+
+
+def test_pptx_keeps_shapes_apart():
+    text = "Q1 Revenue Goals\nTarget Revenue: $3.2 Million\nNew Customer Acquisition: 100 companies"
+    assert split_sentences(text, "pptx") == [
+        "Q1 Revenue Goals",
+        "Target Revenue: $3.2 Million",
+        "New Customer Acquisition: 100 companies",
+    ]
+
+
+def test_txt_keeps_bullets_apart():
+    text = (
+        "AI ASSISTANT LAUNCH - March 15, 2025\n"
+        "Key Features:\n"
+        "  - Natural language processing for complex queries\n"
+        "  - Voice command support (English, Spanish, French, German, Japanese)"
+    )
+    assert split_sentences(text, "txt") == [
+        "AI ASSISTANT LAUNCH - March 15, 2025",
+        "- Natural language processing for complex queries",
+        "- Voice command support (English, Spanish, French, German, Japanese)",
+    ]
+
+
+def test_xlsx_one_span_per_row():
+    text = (
+        "Employee ID | Name | Department | Position\n"
+        "EMP001 | Sarah Johnson | Executive | CEO"
+    )
+    assert split_sentences(text, "xlsx") == [
+        "Employee ID | Name | Department | Position",
+        "EMP001 | Sarah Johnson | Executive | CEO",
+    ]
+
+
+def test_sentence_punctuation_splits_within_a_line():
+    text = "TechCorp was founded in 2020. It builds AI tools for analysts."
+    assert split_sentences(text, "txt") == [
+        "TechCorp was founded in 2020.",
+        "It builds AI tools for analysts.",
+    ]